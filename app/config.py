@@ -1,4 +1,5 @@
 import os
+from functools import cached_property
 from typing import Optional
 
 from pydantic import BaseModel
@@ -12,6 +13,14 @@ class Settings(BaseModel):
     admin_api_key: str = "change-me"
     cors_origins: str = "*"
     log_level: str = "INFO"
+    llama_tokenizer_path: Optional[str] = None
+
+    @cached_property
+    def cors_origins_list(self) -> list[str]:
+        """CORS origins parsed once from the comma-separated setting."""
+        if self.cors_origins.strip() == "*":
+            return ["*"]
+        return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
 
     @classmethod
     def load(cls):
@@ -22,6 +31,7 @@ class Settings(BaseModel):
             admin_api_key=os.getenv("ADMIN_API_KEY", "change-me"),
             cors_origins=os.getenv("CORS_ORIGINS", "*"),
             log_level=os.getenv("LOG_LEVEL", "INFO"),
+            llama_tokenizer_path=os.getenv("LLAMA_TOKENIZER_PATH"),
         )
 
 
@@ -1,16 +1,20 @@
+import asyncio
 import logging
+import os
 import time
 from contextlib import asynccontextmanager
 
+import httpx
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from .config import settings
 from .pricing_loader import PricingLoader
 from .routers import admin, estimate, health, models
 from .services.estimator import EstimationService
+from .tokenizers import tokenizer_factory
 
 # Configure logging
 logging.basicConfig(
@@ -19,35 +23,52 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global instances
-pricing_loader: PricingLoader = None
-estimation_service: EstimationService = None
+# Paths skipped by request logging (health probes and docs)
+_EXCLUDED_PATHS = frozenset({"/healthz/", "/healthz", "/openapi.json", "/docs"})
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    global pricing_loader, estimation_service
-
     # Startup
     logger.info("Starting Token Calculator API...")
 
+    # Shared client so pricing refreshes reuse pooled keep-alive connections
+    app.state.http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(30.0),
+        limits=httpx.Limits(
+            max_connections=20,
+            max_keepalive_connections=10,
+            keepalive_expiry=300,
+        ),
+    )
+
     try:
-        pricing_loader = PricingLoader(settings.pricing_url)
+        pricing_loader = PricingLoader(settings.pricing_url, client=app.state.http_client)
         await pricing_loader.load_pricing()
 
         estimation_service = EstimationService(pricing_loader.pricing_data)
 
+        # Pay tokenizer cold-start (encoding download, BPE tables) before serving
+        tokenizer_names = {config.tokenizer for config in pricing_loader.pricing_data.values()}
+        await asyncio.to_thread(tokenizer_factory.warm_up, tokenizer_names)
+
+        # Routers read these from app.state rather than importing app.main
+        app.state.pricing_loader = pricing_loader
+        app.state.estimation_service = estimation_service
+
         logger.info(f"API started successfully with {len(pricing_loader.pricing_data)} models")
 
     except Exception as e:
         logger.error(f"Failed to start API: {e}")
+        await app.state.http_client.aclose()
         raise
 
     yield
 
     # Shutdown
     logger.info("Shutting down Token Calculator API...")
+    await app.state.http_client.aclose()
 
 
 # Create FastAPI app
@@ -56,15 +77,15 @@ app = FastAPI(
     description="Production-ready Token Cost Calculator API for different LLMs",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     openapi_url="/openapi.json",
 )
 
 # Add CORS middleware
-cors_origins = settings.cors_origins.split(",") if settings.cors_origins != "*" else ["*"]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=cors_origins,
+    allow_origins=settings.cors_origins_list,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -78,11 +99,14 @@ app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all requests with timing."""
-    start_time = time.time()
+    if request.url.path in _EXCLUDED_PATHS:
+        return await call_next(request)
+
+    start_time = time.perf_counter()
 
     response = await call_next(request)
 
-    process_time = time.time() - start_time
+    process_time = time.perf_counter() - start_time
 
     # Log structured request info
     logger.info(
@@ -106,7 +130,7 @@ app.include_router(health.router)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler."""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "detail": "Internal server error",
@@ -121,5 +145,8 @@ if __name__ == "__main__":
         "app.main:app",
         host=os.getenv("HOST", "0.0.0.0"),
         port=settings.port,
+        # "auto" picks uvloop/httptools when installed (not on Windows)
+        loop="auto",
+        http="auto",
         reload=False,
     )
@@ -1,40 +1,73 @@
-import json
 import logging
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Annotated, Any, Optional
 
 import httpx
-from pydantic import BaseModel, Field, field_validator
+import orjson
+from pydantic import Field, TypeAdapter, ValidationError
 
 logger = logging.getLogger(__name__)
 
 
-class PricingConfig(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class PricingConfig:
     """Pricing configuration for a single model."""
 
-    vendor: str = Field(..., description="Vendor name (e.g., 'openai', 'anthropic')")
-    context: Optional[int] = Field(None, description="Context window size")
-    input_per_1k: float = Field(..., description="Input cost per 1k tokens")
-    output_per_1k: Optional[float] = Field(None, description="Output cost per 1k tokens")
-    tokenizer: str = Field(..., description="Tokenizer name")
-    kind: str = Field(..., description="Model kind (chat, embedding, etc.)")
+    vendor: Annotated[str, Field(description="Vendor name (e.g., 'openai', 'anthropic')")]
+    context: Annotated[Optional[int], Field(description="Context window size")] = None
+    input_per_1k: Annotated[float, Field(description="Input cost per 1k tokens")]
+    output_per_1k: Annotated[Optional[float], Field(description="Output cost per 1k tokens")] = None
+    tokenizer: Annotated[str, Field(description="Tokenizer name")]
+    kind: Annotated[str, Field(description="Model kind (chat, embedding, etc.)")]
 
-    @field_validator("input_per_1k", "output_per_1k")
-    @classmethod
-    def validate_positive_costs(cls, v):
-        if v is not None and v < 0:
-            raise ValueError("Cost must be non-negative")
-        return v
+    # Derived per-token prices, computed once at load
+    input_per_token: float = field(init=False, repr=False, compare=False)
+    output_per_token: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        for cost in (self.input_per_1k, self.output_per_1k):
+            if cost is not None and cost < 0:
+                raise ValueError("Cost must be non-negative")
+
+        # Frozen dataclass, so derived fields are set through object.__setattr__
+        object.__setattr__(self, "input_per_token", self.input_per_1k / 1000)
+        object.__setattr__(self, "output_per_token", (self.output_per_1k or 0.0) / 1000)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the configured (non-derived) fields as a dict."""
+        return {
+            "vendor": self.vendor,
+            "context": self.context,
+            "input_per_1k": self.input_per_1k,
+            "output_per_1k": self.output_per_1k,
+            "tokenizer": self.tokenizer,
+            "kind": self.kind,
+        }
+
+
+# Validates a whole pricing table in pydantic-core; PricingConfig itself is a plain dataclass
+_PRICING_ADAPTER = TypeAdapter(dict[str, PricingConfig])
 
 
 class PricingLoader:
     """Loads and validates pricing configuration."""
 
-    def __init__(self, pricing_url: Optional[str] = None):
+    def __init__(
+        self,
+        pricing_url: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
         self.pricing_url = pricing_url
-        self.pricing_data: dict[str, PricingConfig] = {}
+        self.client = client
+        self.pricing_data: Mapping[str, PricingConfig] = {}
+        self._models_listing: Mapping[str, Mapping[str, Any]] = MappingProxyType({})
+        self.models_json: bytes = orjson.dumps({"models": {}})
 
-    async def load_pricing(self) -> dict[str, PricingConfig]:
+    async def load_pricing(self) -> Mapping[str, PricingConfig]:
         """Load pricing configuration from URL or local file."""
         try:
             if self.pricing_url:
@@ -51,11 +84,15 @@ class PricingLoader:
 
     async def _load_from_url(self) -> None:
         """Load pricing from remote URL."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(self.pricing_url)
-            response.raise_for_status()
-            data = response.json()
-            self._validate_and_store(data)
+        if self.client is None:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(self.pricing_url)
+        else:
+            response = await self.client.get(self.pricing_url)
+
+        response.raise_for_status()
+        data = response.json()
+        self._validate_and_store(data)
 
     def _load_from_file(self) -> None:
         """Load pricing from local file."""
@@ -63,39 +100,43 @@ class PricingLoader:
         if not pricing_file.exists():
             raise FileNotFoundError("pricing.json not found")
 
-        with open(pricing_file) as f:
-            data = json.load(f)
-
+        data = orjson.loads(pricing_file.read_bytes())
         self._validate_and_store(data)
 
     def _validate_and_store(self, data: dict[str, Any]) -> None:
         """Validate and store pricing data."""
-        validated_data = {}
-
-        for model_name, config_data in data.items():
-            try:
-                validated_config = PricingConfig(**config_data)
-                validated_data[model_name] = validated_config
-            except Exception as e:
-                logger.error(f"Invalid pricing config for {model_name}: {e}")
-                raise ValueError(f"Invalid pricing config for {model_name}: {e}")
+        try:
+            validated_data = _PRICING_ADAPTER.validate_python(data)
+        except ValidationError as e:
+            # Report the first failing model, as the per-model loop used to
+            error = e.errors()[0]
+            model_name = error["loc"][0] if error["loc"] else "<root>"
+            logger.error(f"Invalid pricing config for {model_name}: {e}")
+            raise ValueError(f"Invalid pricing config for {model_name}: {e}")
+
+        # Read-only view with interned keys, safe to share across worker threads
+        self.pricing_data = MappingProxyType({
+            sys.intern(model_name): config
+            for model_name, config in validated_data.items()
+        })
+
+        # Pricing only changes on load, so build the /models payload once here
+        models_listing = {
+            model_name: config.to_dict()
+            for model_name, config in validated_data.items()
+        }
+        self.models_json = orjson.dumps({"models": models_listing})
 
-        self.pricing_data = validated_data
+        # Shared with every caller, so expose it read-only like pricing_data
+        self._models_listing = MappingProxyType({
+            model_name: MappingProxyType(listing)
+            for model_name, listing in models_listing.items()
+        })
 
     def get_model_config(self, model_name: str) -> Optional[PricingConfig]:
         """Get pricing configuration for a specific model."""
         return self.pricing_data.get(model_name)
 
-    def list_models(self) -> dict[str, dict[str, Any]]:
+    def list_models(self) -> Mapping[str, Mapping[str, Any]]:
         """List all available models with their configurations."""
-        return {
-            model_name: {
-                "vendor": config.vendor,
-                "context": config.context,
-                "input_per_1k": config.input_per_1k,
-                "output_per_1k": config.output_per_1k,
-                "tokenizer": config.tokenizer,
-                "kind": config.kind,
-            }
-            for model_name, config in self.pricing_data.items()
-        }
+        return self._models_listing
@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Depends, Header, HTTPException
+import hmac
 
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+
+from ..config import settings
 from ..schemas import RefreshResponse
 
 router = APIRouter(prefix="/prices", tags=["admin"])
@@ -7,15 +10,18 @@ router = APIRouter(prefix="/prices", tags=["admin"])
 
 def verify_api_key(x_api_key: str = Header(None)):
     """Verify API key for admin endpoints."""
-    from ..config import settings
-
-    if not x_api_key or x_api_key != settings.admin_api_key:
+    # Constant-time comparison so response timing does not leak the key
+    if not x_api_key or not hmac.compare_digest(
+        x_api_key.encode(),
+        settings.admin_api_key.encode(),
+    ):
         raise HTTPException(status_code=401, detail="Invalid API key")
     return x_api_key
 
 
 @router.post("/refresh", response_model=RefreshResponse)
 async def refresh_pricing(
+    request: Request,
     api_key: str = Depends(verify_api_key),
 ) -> RefreshResponse:
     """
@@ -24,8 +30,9 @@ async def refresh_pricing(
     Requires X-API-Key header with valid admin key.
     """
     try:
-        from ..main import pricing_loader
+        pricing_loader = request.app.state.pricing_loader
         await pricing_loader.load_pricing()
+        request.app.state.estimation_service.update_pricing(pricing_loader.pricing_data)
 
         models_count = len(pricing_loader.pricing_data)
         return RefreshResponse(
@@ -1,6 +1,8 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
 
-from fastapi import APIRouter, Depends, HTTPException
-
+from ..routing import ORJSONRoute
 from ..schemas import (
     BatchEstimateRequest,
     BatchEstimateResponse,
@@ -9,22 +11,22 @@ from ..schemas import (
 )
 from ..services.estimator import EstimationService
 
-router = APIRouter(prefix="/estimate", tags=["estimation"])
+router = APIRouter(prefix="/estimate", tags=["estimation"], route_class=ORJSONRoute)
 
 
-def get_estimation_service() -> EstimationService:
+def get_estimation_service(request: Request) -> EstimationService:
     """Dependency to get estimation service."""
-    from ..main import estimation_service
+    estimation_service = getattr(request.app.state, "estimation_service", None)
     if estimation_service is None:
         raise HTTPException(status_code=500, detail="Estimation service not initialized")
     return estimation_service
 
 
-@router.post("/", response_model=EstimateResponse)
+@router.post("/", responses={200: {"model": EstimateResponse}})
 async def estimate_tokens(
     request: EstimateRequest,
     service: EstimationService = Depends(get_estimation_service),
-) -> EstimateResponse:
+) -> ORJSONResponse:
     """
     Estimate token usage and cost for a single request.
 
@@ -35,42 +37,36 @@ async def estimate_tokens(
     - Context utilization warnings
     """
     try:
-        return service.estimate(request)
+        # Tokenization is CPU-bound; run it off the event loop
+        result = await run_in_threadpool(service.estimate, request)
+        return ORJSONResponse(content=result.model_dump(mode="json"))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Estimation failed: {e!s}")
 
 
-@router.post("/batch", response_model=BatchEstimateResponse)
+@router.post("/batch", responses={200: {"model": BatchEstimateResponse}})
 async def estimate_batch(
     request: BatchEstimateRequest,
     service: EstimationService = Depends(get_estimation_service),
-) -> BatchEstimateResponse:
+) -> ORJSONResponse:
     """
     Estimate token usage and cost for multiple requests.
 
     Returns individual results plus aggregated totals.
     """
     try:
-        results = []
-        total_cost = 0
-        total_input_tokens = 0
-        total_output_tokens = 0
-
-        for req in request.requests:
-            result = service.estimate(req)
-            results.append(result)
-            total_cost += result.cost
-            total_input_tokens += result.input_tokens
-            total_output_tokens += result.output_tokens
+        # Tokenization is CPU-bound; run it off the event loop
+        results = await run_in_threadpool(service.estimate_batch, request.requests)
 
-        return BatchEstimateResponse(
+        response = BatchEstimateResponse.model_construct(
             results=results,
-            total_cost=total_cost,
-            total_input_tokens=total_input_tokens,
-            total_output_tokens=total_output_tokens,
+            total_cost=sum(result.cost for result in results),
+            total_input_tokens=sum(result.input_tokens for result in results),
+            total_output_tokens=sum(result.output_tokens for result in results),
         )
+        return ORJSONResponse(content=response.model_dump(mode="json"))
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 
 from ..schemas import HealthResponse
 
@@ -6,15 +6,14 @@ router = APIRouter(prefix="/healthz", tags=["health"])
 
 
 @router.get("/", response_model=HealthResponse)
-async def health_check() -> HealthResponse:
+async def health_check(request: Request) -> HealthResponse:
     """
     Health check endpoint.
 
     Returns service status and number of loaded models.
     """
     try:
-        from ..main import pricing_loader
-        models_count = len(pricing_loader.pricing_data)
+        models_count = len(request.app.state.pricing_loader.pricing_data)
         return HealthResponse(ok=True, models=models_count)
     except Exception:
         return HealthResponse(ok=False, models=0)
@@ -1,25 +1,25 @@
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
 from ..schemas import ModelsResponse
 
 router = APIRouter(prefix="/models", tags=["models"])
 
 
-def get_pricing_loader():
+def get_pricing_loader(request: Request):
     """Dependency to get pricing loader."""
-    from ..main import pricing_loader
+    pricing_loader = getattr(request.app.state, "pricing_loader", None)
     if pricing_loader is None:
         raise HTTPException(status_code=500, detail="Pricing loader not initialized")
     return pricing_loader
 
 
 @router.get("/", response_model=ModelsResponse)
-async def list_models(loader=Depends(get_pricing_loader)) -> ModelsResponse:
+async def list_models(loader=Depends(get_pricing_loader)) -> Response:
     """
     List all available models with their pricing configurations.
 
-    Returns the current pricing table loaded in memory.
+    Returns the current pricing table loaded in memory, serialized once per
+    pricing load.
     """
-    models = loader.list_models()
-    return ModelsResponse(models=models)
+    return Response(content=loader.models_json, media_type="application/json")
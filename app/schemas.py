@@ -1,6 +1,7 @@
-from typing import Any, Optional
+from dataclasses import dataclass
+from typing import Annotated, Any, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class EstimateRequest(BaseModel):
@@ -10,16 +11,10 @@ class EstimateRequest(BaseModel):
     system: Optional[str] = Field(None, description="System prompt")
     user: Optional[str] = Field(None, description="User prompt")
     tools_json: Optional[str] = Field(None, description="Tools JSON string")
-    expected_output_tokens: int = Field(..., description="Expected output token count")
+    # ge=0 is enforced inside pydantic-core, avoiding a Python validator call per request
+    expected_output_tokens: int = Field(..., ge=0, description="Expected output token count")
     rag: Optional["RAGConfig"] = Field(None, description="RAG configuration")
 
-    @field_validator("expected_output_tokens")
-    @classmethod
-    def validate_output_tokens(cls, v):
-        if v < 0:
-            raise ValueError("Expected output tokens must be non-negative")
-        return v
-
 
 class RAGConfig(BaseModel):
     """RAG configuration for embeddings and vector operations."""
@@ -29,25 +24,30 @@ class RAGConfig(BaseModel):
     vector_read_fee_per_1k: float = Field(0.0, description="Vector read fee per 1k tokens")
 
 
-class TokenizerInfo(BaseModel):
+@dataclass(slots=True, frozen=True)
+class TokenizerInfo:
     """Tokenizer information."""
 
-    name: str = Field(..., description="Tokenizer name")
-    approx: bool = Field(..., description="Whether this is an approximation")
+    name: Annotated[str, Field(description="Tokenizer name")]
+    approx: Annotated[bool, Field(description="Whether this is an approximation")]
 
 
-class CostBreakdown(BaseModel):
+@dataclass(slots=True, frozen=True)
+class CostBreakdown:
     """Cost breakdown by component."""
 
-    model_input_cost: float = Field(..., description="Model input cost")
-    model_output_cost: float = Field(..., description="Model output cost")
-    embedding_cost: float = Field(..., description="Embedding cost")
-    vector_io_cost: float = Field(..., description="Vector I/O cost")
+    model_input_cost: Annotated[float, Field(description="Model input cost")]
+    model_output_cost: Annotated[float, Field(description="Model output cost")]
+    embedding_cost: Annotated[float, Field(description="Embedding cost")]
+    vector_io_cost: Annotated[float, Field(description="Vector I/O cost")]
 
 
 class EstimateResponse(BaseModel):
     """Response model for token estimation."""
 
+    # Responses are cached and shared, so they must not be mutated
+    model_config = ConfigDict(frozen=True)
+
     model: str = Field(..., description="Model identifier")
     tokenizer: TokenizerInfo = Field(..., description="Tokenizer information")
     input_tokens: int = Field(..., description="Input token count")
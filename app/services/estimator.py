@@ -1,3 +1,7 @@
+import threading
+from collections import OrderedDict
+from typing import Optional
+
 from ..pricing_loader import PricingConfig
 from ..schemas import (
     CostBreakdown,
@@ -6,24 +10,135 @@ from ..schemas import (
     RAGConfig,
     TokenizerInfo,
 )
-from ..tokenizers import tokenizer_factory
+from ..tokenizers import _digest, tokenizer_factory
 
 
 class EstimationService:
     """Service for estimating token usage and costs."""
 
+    # Maximum number of responses kept in the LRU cache
+    cache_size = 1024
+
     def __init__(self, pricing_configs: dict):
-        self.pricing_configs = pricing_configs
+        # Estimates are pure functions of the request, so repeats are cached;
+        # responses are frozen and the same instance is shared between callers
+        self._cache: OrderedDict[tuple, EstimateResponse] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pricing_version = 0
+        self.update_pricing(pricing_configs)
+
+    def update_pricing(self, pricing_configs: dict) -> None:
+        """Swap in new pricing configuration and drop cached estimates."""
+        # Index the first embedding model per vendor for RAG cost lookups
+        embedding_by_vendor: dict[str, PricingConfig] = {}
+        for config in pricing_configs.values():
+            if config.kind == "embedding":
+                embedding_by_vendor.setdefault(config.vendor, config)
+
+        with self._cache_lock:
+            self.pricing_configs = pricing_configs
+            self.embedding_by_vendor = embedding_by_vendor
+            self._pricing_version += 1
+            self._cache.clear()
 
     def estimate(self, request: EstimateRequest) -> EstimateResponse:
         """Estimate token usage and cost for a request."""
+        cache_key = self._cache_key(request)
+
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                return cached
+            pricing_version = self._pricing_version
+
+        response = self._estimate_uncached(request)
+        self._cache_store(cache_key, response, pricing_version)
+        return response
+
+    def estimate_batch(self, requests: list[EstimateRequest]) -> list[EstimateResponse]:
+        """Estimate several requests, tokenizing uncached prompts in one batch per tokenizer."""
+        cache_keys = [self._cache_key(request) for request in requests]
+        results: list[Optional[EstimateResponse]] = [None] * len(requests)
+
+        with self._cache_lock:
+            for i, cache_key in enumerate(cache_keys):
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    self._cache.move_to_end(cache_key)
+                    results[i] = cached
+            pricing_version = self._pricing_version
+
+        # Group the prompt texts of cache misses by tokenizer
+        texts_by_tokenizer: dict[str, list[str]] = {}
+        owners_by_tokenizer: dict[str, list[int]] = {}
+        for i, request in enumerate(requests):
+            if results[i] is not None:
+                continue
+            pricing_config = self.pricing_configs.get(request.model)
+            if not pricing_config:
+                raise ValueError(f"Unknown model: {request.model}")
+            for text in (request.system, request.user, request.tools_json):
+                if text:
+                    texts_by_tokenizer.setdefault(pricing_config.tokenizer, []).append(text)
+                    owners_by_tokenizer.setdefault(pricing_config.tokenizer, []).append(i)
+
+        input_tokens = [0] * len(requests)
+        for tokenizer_name, texts in texts_by_tokenizer.items():
+            counts = tokenizer_factory.count_tokens_many(texts, tokenizer_name)
+            for i, count in zip(owners_by_tokenizer[tokenizer_name], counts):
+                input_tokens[i] += count
+
+        for i, request in enumerate(requests):
+            if results[i] is None:
+                results[i] = self._estimate_uncached(request, input_tokens[i])
+                self._cache_store(cache_keys[i], results[i], pricing_version)
+
+        return results
+
+    def _cache_key(self, request: EstimateRequest) -> tuple:
+        """Response cache key for a request."""
+        rag = request.rag
+        # Prompts are keyed by fixed-size digests so entries stay small; the
+        # other fields are kept as-is so collisions are settled by equality
+        return (
+            request.model,
+            request.system and _digest(request.system),
+            request.user and _digest(request.user),
+            request.tools_json and _digest(request.tools_json),
+            request.expected_output_tokens,
+            rag and (rag.embedding_tokens, rag.num_vectors_read, rag.vector_read_fee_per_1k),
+        )
+
+    def _cache_store(
+        self,
+        cache_key: tuple,
+        response: EstimateResponse,
+        pricing_version: int,
+    ) -> None:
+        """Cache a response unless pricing changed while it was computed."""
+        with self._cache_lock:
+            # Don't cache a result computed against pricing that was since replaced
+            if pricing_version != self._pricing_version:
+                return
+            self._cache[cache_key] = response
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _estimate_uncached(
+        self,
+        request: EstimateRequest,
+        input_tokens: Optional[int] = None,
+    ) -> EstimateResponse:
+        """Estimate token usage and cost without consulting the cache."""
         # Get pricing configuration
         pricing_config = self.pricing_configs.get(request.model)
         if not pricing_config:
             raise ValueError(f"Unknown model: {request.model}")
 
-        # Count input tokens
-        input_tokens = self._count_input_tokens(request, pricing_config.tokenizer)
+        # Count input tokens unless the batch path already did
+        if input_tokens is None:
+            input_tokens = self._count_input_tokens(request, pricing_config.tokenizer)
 
         # Calculate costs
         cost_breakdown = self._calculate_costs(
@@ -49,13 +164,13 @@ class EstimationService:
         )
 
         # Get tokenizer info
-        _, is_approx = tokenizer_factory.count_tokens("test", pricing_config.tokenizer)
         tokenizer_info = TokenizerInfo(
-            name=pricing_config.tokenizer,
-            approx=is_approx,
+            name=tokenizer_factory.reported_name(pricing_config.tokenizer),
+            approx=tokenizer_factory.is_approx(pricing_config.tokenizer),
         )
 
-        return EstimateResponse(
+        # Every field is server-computed, so skip response validation
+        return EstimateResponse.model_construct(
             model=request.model,
             tokenizer=tokenizer_info,
             input_tokens=input_tokens,
@@ -70,24 +185,16 @@ class EstimationService:
 
     def _count_input_tokens(self, request: EstimateRequest, tokenizer_name: str) -> int:
         """Count total input tokens."""
-        total_tokens = 0
-
-        # Count system prompt tokens
-        if request.system:
-            tokens, _ = tokenizer_factory.count_tokens(request.system, tokenizer_name)
-            total_tokens += tokens
-
-        # Count user prompt tokens
-        if request.user:
-            tokens, _ = tokenizer_factory.count_tokens(request.user, tokenizer_name)
-            total_tokens += tokens
+        # System prompt, user prompt and tools JSON are counted in one call
+        texts = [
+            text
+            for text in (request.system, request.user, request.tools_json)
+            if text
+        ]
+        if not texts:
+            return 0
 
-        # Count tools JSON tokens
-        if request.tools_json:
-            tokens, _ = tokenizer_factory.count_tokens(request.tools_json, tokenizer_name)
-            total_tokens += tokens
-
-        return total_tokens
+        return tokenizer_factory.count_tokens_batch(texts, tokenizer_name)
 
     def _calculate_costs(
         self,
@@ -98,28 +205,20 @@ class EstimationService:
     ) -> CostBreakdown:
         """Calculate cost breakdown."""
         # Model input cost
-        model_input_cost = (input_tokens / 1000) * pricing_config.input_per_1k
+        model_input_cost = input_tokens * pricing_config.input_per_token
 
         # Model output cost
-        model_output_cost = 0
-        if pricing_config.output_per_1k:
-            model_output_cost = (output_tokens / 1000) * pricing_config.output_per_1k
+        model_output_cost = output_tokens * pricing_config.output_per_token
 
         # Embedding cost
-        embedding_cost = 0
+        embedding_cost = 0.0
         if rag_config and rag_config.embedding_tokens > 0:
-            # Find embedding model pricing
-            embedding_model = None
-            for model_name, config in self.pricing_configs.items():
-                if config.kind == "embedding" and config.vendor == pricing_config.vendor:
-                    embedding_model = config
-                    break
-
+            embedding_model = self.embedding_by_vendor.get(pricing_config.vendor)
             if embedding_model:
-                embedding_cost = (rag_config.embedding_tokens / 1000) * embedding_model.input_per_1k
+                embedding_cost = rag_config.embedding_tokens * embedding_model.input_per_token
 
         # Vector I/O cost
-        vector_io_cost = 0
+        vector_io_cost = 0.0
         if rag_config and rag_config.num_vectors_read > 0:
             vector_io_cost = rag_config.num_vectors_read * rag_config.vector_read_fee_per_1k
 
@@ -148,8 +247,7 @@ class EstimationService:
                 warnings.append(f"High context utilization: {utilization_pct:.1f}% of {context_limit:,} tokens")
 
         # Approximation warning
-        _, is_approx = tokenizer_factory.count_tokens("test", tokenizer_name)
-        if is_approx:
+        if tokenizer_factory.is_approx(tokenizer_name):
             warnings.append(f"Tokenizer '{tokenizer_name}' uses approximation - actual token counts may vary")
 
         return warnings
@@ -1,45 +1,176 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Optional
 
+from ..config import settings
 from .anthropic_approx import AnthropicTokenizer
 from .base import BaseTokenizer
 from .llama_bpe_approx import LlamaTokenizer
 from .openai_tiktoken import OpenAITokenizer
 
+logger = logging.getLogger(__name__)
+
+# Memoized token counts: oldest entries are evicted first past this size
+_COUNT_CACHE_SIZE = 10_000
+
+# Shorter texts are counted directly, since hashing would dominate
+_MIN_CACHED_LENGTH = 32
+
+
+def _digest(text: str) -> bytes:
+    """Fixed-size cache key for a text."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def _make_llama_tokenizer() -> BaseTokenizer:
+    """Use the real Llama BPE when a tokenizer.json is configured, else approximate."""
+    tokenizer_path = settings.llama_tokenizer_path
+    if not tokenizer_path:
+        return LlamaTokenizer()
+    if not Path(tokenizer_path).is_file():
+        logger.warning(f"Falling back to Llama approximation: {tokenizer_path} not found")
+        return LlamaTokenizer()
+
+    try:
+        # Imported lazily so the approximation works without the tokenizers package
+        from .llama_hf import LlamaHFTokenizer
+
+        return LlamaHFTokenizer(tokenizer_path)
+    except (ImportError, ValueError) as e:
+        logger.warning(f"Falling back to Llama approximation: {e}")
+        return LlamaTokenizer()
+
+
+# Tokenizer constructors by name; built lazily so encodings load on first use
+_TOKENIZER_BUILDERS: dict[str, Callable[[], BaseTokenizer]] = {
+    "o200k_base": partial(OpenAITokenizer, "o200k_base"),
+    "cl100k_base": partial(OpenAITokenizer, "cl100k_base"),
+    "anthropic_approx_bpe": AnthropicTokenizer,
+    "llama_approx_bpe": _make_llama_tokenizer,
+}
+
+
+@lru_cache(maxsize=16)
+def _make_tokenizer(tokenizer_name: str) -> BaseTokenizer:
+    """Create a tokenizer based on the name (cached per name)."""
+    builder = _TOKENIZER_BUILDERS.get(tokenizer_name)
+    if builder is not None:
+        return builder()
+    if tokenizer_name.startswith("o") and tokenizer_name.endswith("_base"):
+        # Other OpenAI tiktoken encodings
+        return OpenAITokenizer(tokenizer_name)
+    # Default to cl100k_base for unknown types
+    return OpenAITokenizer("cl100k_base")
+
 
 class TokenizerFactory:
     """Factory for creating tokenizers."""
 
     def __init__(self):
-        self._tokenizers: dict[str, BaseTokenizer] = {}
+        self._count_cache: OrderedDict[tuple[str, bytes], tuple[int, bool]] = OrderedDict()
+        self._count_cache_lock = threading.Lock()
+        self._warmed: set[str] = set()
 
     def get_tokenizer(self, tokenizer_name: str) -> BaseTokenizer:
         """Get or create a tokenizer by name."""
-        if tokenizer_name in self._tokenizers:
-            return self._tokenizers[tokenizer_name]
-
-        tokenizer = self._create_tokenizer(tokenizer_name)
-        self._tokenizers[tokenizer_name] = tokenizer
-        return tokenizer
-
-    def _create_tokenizer(self, tokenizer_name: str) -> BaseTokenizer:
-        """Create a tokenizer based on the name."""
-        if tokenizer_name.startswith("o") and tokenizer_name.endswith("_base"):
-            # OpenAI tiktoken encodings
-            return OpenAITokenizer(tokenizer_name)
-        elif tokenizer_name == "cl100k_base":
-            # OpenAI GPT-4 tokenizer
-            return OpenAITokenizer(tokenizer_name)
-        elif tokenizer_name == "anthropic_approx_bpe":
-            return AnthropicTokenizer()
-        elif tokenizer_name == "llama_approx_bpe":
-            return LlamaTokenizer()
-        else:
-            # Default to cl100k_base for unknown types
-            return OpenAITokenizer("cl100k_base")
+        return _make_tokenizer(tokenizer_name)
+
+    def reported_name(self, tokenizer_name: str) -> str:
+        """Name of the tokenizer actually used for a configured tokenizer name."""
+        return _make_tokenizer(tokenizer_name).reported_name or tokenizer_name
+
+    def is_approx(self, tokenizer_name: str) -> bool:
+        """Whether the named tokenizer returns approximate counts."""
+        return _make_tokenizer(tokenizer_name).approx
+
+    def warm_up(self, tokenizer_names: set[str]) -> None:
+        """Build and exercise tokenizers ahead of the first request."""
+        for tokenizer_name in tokenizer_names - self._warmed:
+            try:
+                # Loads encoding files and compiles patterns outside request latency
+                _make_tokenizer(tokenizer_name).count_tokens("warmup")
+            except Exception as e:
+                # Leave it to load lazily on first use; keep warming the others
+                logger.warning(f"Tokenizer warm-up failed for {tokenizer_name}: {e}")
+                continue
+            self._warmed.add(tokenizer_name)
 
     def count_tokens(self, text: str, tokenizer_name: str) -> tuple[int, bool]:
         """Count tokens using the specified tokenizer."""
-        tokenizer = self.get_tokenizer(tokenizer_name)
-        return tokenizer.count_tokens(text)
+        return self._count_cached(_make_tokenizer(tokenizer_name), tokenizer_name, text)
+
+    def count_tokens_batch(self, texts: list[str], tokenizer_name: str) -> int:
+        """Count total tokens across several texts using one tokenizer."""
+        tokenizer = _make_tokenizer(tokenizer_name)
+        return sum(
+            self._count_cached(tokenizer, tokenizer_name, text)[0] for text in texts
+        )
+
+    def count_tokens_many(self, texts: list[str], tokenizer_name: str) -> list[int]:
+        """Count tokens for each text, encoding all uncached texts in one batch."""
+        tokenizer = _make_tokenizer(tokenizer_name)
+        counts: list[Optional[int]] = [None] * len(texts)
+        keys: dict[int, tuple[str, bytes]] = {
+            i: (tokenizer_name, _digest(text))
+            for i, text in enumerate(texts)
+            if len(text) >= _MIN_CACHED_LENGTH
+        }
+
+        with self._count_cache_lock:
+            for i, key in keys.items():
+                cached = self._count_cache.get(key)
+                if cached is not None:
+                    counts[i] = cached[0]
+
+        # Short texts and cache misses share a single batch call
+        pending = [i for i, count in enumerate(counts) if count is None and texts[i]]
+        if pending:
+            pending_counts = tokenizer.count_tokens_many([texts[i] for i in pending])
+            for i, count in zip(pending, pending_counts):
+                counts[i] = count
+
+            with self._count_cache_lock:
+                for i in pending:
+                    if i in keys:
+                        self._count_cache[keys[i]] = (counts[i], tokenizer.approx)
+                while len(self._count_cache) > _COUNT_CACHE_SIZE:
+                    self._count_cache.popitem(last=False)
+
+        return [count or 0 for count in counts]
+
+    def _count_cached(
+        self,
+        tokenizer: BaseTokenizer,
+        tokenizer_name: str,
+        text: str,
+    ) -> tuple[int, bool]:
+        """Count tokens, memoizing results for longer texts."""
+        # Empty prompts (e.g. an omitted system field) need no tokenizer call
+        if not text:
+            return 0, tokenizer.approx
+        if len(text) < _MIN_CACHED_LENGTH:
+            return tokenizer.count_tokens(text)
+
+        key = (tokenizer_name, _digest(text))
+
+        with self._count_cache_lock:
+            cached = self._count_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = tokenizer.count_tokens(text)
+
+        with self._count_cache_lock:
+            self._count_cache[key] = result
+            if len(self._count_cache) > _COUNT_CACHE_SIZE:
+                self._count_cache.popitem(last=False)
+
+        return result
 
 
 # Global factory instance
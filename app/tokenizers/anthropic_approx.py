@@ -1,10 +1,14 @@
 
+from typing import ClassVar
+
 from .base import BaseTokenizer
 
 
 class AnthropicTokenizer(BaseTokenizer):
     """Anthropic tokenizer using approximation."""
 
+    approx: ClassVar[bool] = True
+
     def __init__(self):
         # Simple approximation: ~4 characters per token for English text
         self.chars_per_token = 4.0
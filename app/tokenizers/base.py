@@ -1,9 +1,16 @@
 from abc import ABC, abstractmethod
+from typing import ClassVar, Optional
 
 
 class BaseTokenizer(ABC):
     """Base class for tokenizers."""
 
+    # Whether counts are approximate; a static property of each tokenizer class
+    approx: ClassVar[bool]
+
+    # Name reported to API consumers when it differs from the configured one
+    reported_name: ClassVar[Optional[str]] = None
+
     @abstractmethod
     def count_tokens(self, text: str) -> tuple[int, bool]:
         """
@@ -12,3 +19,7 @@ class BaseTokenizer(ABC):
         Returns:
             Tuple of (token_count, is_approximation)
         """
+
+    def count_tokens_many(self, texts: list[str]) -> list[int]:
+        """Count tokens for each of several texts."""
+        return [self.count_tokens(text)[0] for text in texts]
@@ -1,22 +1,25 @@
 
+import re
+from typing import ClassVar
+
 from .base import BaseTokenizer
 
 
 class LlamaTokenizer(BaseTokenizer):
     """Llama/Mistral tokenizer using approximation."""
 
-    def __init__(self):
-        # Simple approximation: ~3.5 characters per token for English text
-        self.chars_per_token = 3.5
+    approx: ClassVar[bool] = True
+
+    # Words and individual punctuation marks, compiled once for all instances
+    _token_re: ClassVar[re.Pattern[str]] = re.compile(r"\w+|[^\w\s]")
 
     def count_tokens(self, text: str) -> tuple[int, bool]:
-        """Count tokens using character-based approximation."""
+        """Count tokens using word and punctuation approximation."""
         if not text:
             return 0, True
 
-        # Simple approximation based on character count
-        char_count = len(text)
-        token_count = int(char_count / self.chars_per_token)
+        # Approximate one token per word or punctuation mark
+        token_count = len(self._token_re.findall(text))
 
         # Ensure minimum of 1 token for non-empty text
         return max(1, token_count), True
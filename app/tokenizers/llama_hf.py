@@ -0,0 +1,45 @@
+from functools import lru_cache
+from typing import ClassVar
+
+from tokenizers import Tokenizer
+
+from .base import BaseTokenizer
+
+
+@lru_cache(maxsize=None)
+def _load_tokenizer(path: str) -> Tokenizer:
+    """Load a tokenizer.json once per process and share it."""
+    return Tokenizer.from_file(path)
+
+
+class LlamaHFTokenizer(BaseTokenizer):
+    """Llama tokenizer using a Hugging Face tokenizer.json (exact)."""
+
+    approx: ClassVar[bool] = False
+    reported_name: ClassVar[str] = "llama_bpe"
+
+    def __init__(self, tokenizer_path: str):
+        self.tokenizer_path = tokenizer_path
+        try:
+            self.tokenizer = _load_tokenizer(tokenizer_path)
+        except Exception as e:
+            raise ValueError(f"Failed to load Llama tokenizer '{tokenizer_path}': {e}")
+
+    def count_tokens(self, text: str) -> tuple[int, bool]:
+        """Count tokens using the Llama BPE tokenizer (exact)."""
+        if not text:
+            return 0, False
+
+        try:
+            encoding = self.tokenizer.encode(text, add_special_tokens=False)
+            return len(encoding.ids), False
+        except Exception as e:
+            raise ValueError(f"Tokenization failed: {e}")
+
+    def count_tokens_many(self, texts: list[str]) -> list[int]:
+        """Count tokens for each of several texts, encoding them in parallel."""
+        try:
+            encodings = self.tokenizer.encode_batch(texts, add_special_tokens=False)
+            return [len(encoding.ids) for encoding in encodings]
+        except Exception as e:
+            raise ValueError(f"Tokenization failed: {e}")
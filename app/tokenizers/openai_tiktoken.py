@@ -1,12 +1,24 @@
 
+import os
+from functools import lru_cache
+from typing import ClassVar
+
 import tiktoken
 
 from .base import BaseTokenizer
 
 
+@lru_cache(maxsize=None)
+def _get_encoding(encoding_name: str) -> tiktoken.Encoding:
+    """Load a tiktoken encoding once per process and share it."""
+    return tiktoken.get_encoding(encoding_name)
+
+
 class OpenAITokenizer(BaseTokenizer):
     """OpenAI tokenizer using tiktoken."""
 
+    approx: ClassVar[bool] = False
+
     def __init__(self, encoding_name: str):
         self.encoding_name = encoding_name
         try:
@@ -16,11 +28,11 @@ class OpenAITokenizer(BaseTokenizer):
                 "cl100k_base": "cl100k_base",
             }
             actual_encoding = encoding_map.get(encoding_name, "cl100k_base")
-            self.encoding = tiktoken.get_encoding(actual_encoding)
+            self.encoding = _get_encoding(actual_encoding)
         except Exception as e:
             # Fallback to cl100k_base if the specific encoding is not available
             try:
-                self.encoding = tiktoken.get_encoding("cl100k_base")
+                self.encoding = _get_encoding("cl100k_base")
             except Exception:
                 raise ValueError(f"Failed to load tiktoken encoding '{encoding_name}': {e}")
 
@@ -34,3 +46,18 @@ class OpenAITokenizer(BaseTokenizer):
             return len(tokens), False  # tiktoken is exact
         except Exception as e:
             raise ValueError(f"Tokenization failed: {e}")
+
+    def count_tokens_many(self, texts: list[str]) -> list[int]:
+        """Count tokens for each of several texts, encoding them in parallel."""
+        if len(texts) < 2:
+            return [self.count_tokens(text)[0] for text in texts]
+
+        # encode_batch fans out over a thread pool; tiktoken releases the GIL
+        num_threads = min(len(texts), os.cpu_count() or 1)
+        try:
+            return [
+                len(tokens)
+                for tokens in self.encoding.encode_batch(texts, num_threads=num_threads)
+            ]
+        except Exception as e:
+            raise ValueError(f"Tokenization failed: {e}")
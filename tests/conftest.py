@@ -0,0 +1,65 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.main import app
+from app.pricing_loader import PricingConfig
+from app.services.estimator import EstimationService
+
+# Canonical pricing configs, built once at import and shared read-only
+_OPENAI_MINI = PricingConfig(
+    vendor="openai",
+    context=128000,
+    input_per_1k=0.15,
+    output_per_1k=0.60,
+    tokenizer="cl100k_base",
+    kind="chat",
+)
+_CLAUDE_SONNET = PricingConfig(
+    vendor="anthropic",
+    context=200000,
+    input_per_1k=3.00,
+    output_per_1k=15.00,
+    tokenizer="anthropic_approx_bpe",
+    kind="chat",
+)
+_OPENAI_EMBEDDING = PricingConfig(
+    vendor="openai",
+    input_per_1k=0.02,
+    tokenizer="cl100k_base",
+    kind="embedding",
+)
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """Session-wide event loop so the API client can be shared."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+async def client():
+    """In-process ASGI client with the app lifespan running."""
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
+
+
+@pytest.fixture(scope="session")
+def sample_pricing():
+    """Sample pricing data for testing."""
+    return {
+        "openai:gpt-4o-mini": _OPENAI_MINI,
+        "anthropic:claude-3-5-sonnet": _CLAUDE_SONNET,
+        "openai:text-embedding-3-small": _OPENAI_EMBEDDING,
+    }
+
+
+@pytest.fixture()
+def estimation_service(sample_pricing):
+    """Estimation service fixture, fresh per test since it caches responses."""
+    return EstimationService(sample_pricing)
@@ -1,54 +1,9 @@
-
 import pytest
-from fastapi.testclient import TestClient
+from pydantic import ValidationError
 
-from app.main import app
 from app.pricing_loader import PricingLoader
 from app.schemas import EstimateRequest, RAGConfig
-from app.services.estimator import EstimationService
-
-
-@pytest.fixture()
-def client():
-    """Test client fixture."""
-    return TestClient(app)
-
-
-@pytest.fixture()
-def sample_pricing():
-    """Sample pricing data for testing."""
-    from app.pricing_loader import PricingConfig
-
-    return {
-        "openai:gpt-4o-mini": PricingConfig(
-            vendor="openai",
-            context=128000,
-            input_per_1k=0.15,
-            output_per_1k=0.60,
-            tokenizer="cl100k_base",
-            kind="chat",
-        ),
-        "anthropic:claude-3-5-sonnet": PricingConfig(
-            vendor="anthropic",
-            context=200000,
-            input_per_1k=3.00,
-            output_per_1k=15.00,
-            tokenizer="anthropic_approx_bpe",
-            kind="chat",
-        ),
-        "openai:text-embedding-3-small": PricingConfig(
-            vendor="openai",
-            input_per_1k=0.02,
-            tokenizer="cl100k_base",
-            kind="embedding",
-        ),
-    }
-
-
-@pytest.fixture()
-def estimation_service(sample_pricing):
-    """Estimation service fixture."""
-    return EstimationService(sample_pricing)
+from app.tokenizers import tokenizer_factory
 
 
 class TestEstimationService:
@@ -91,6 +46,20 @@ class TestEstimationService:
         assert result.breakdown.embedding_cost > 0
         assert result.breakdown.vector_io_cost > 0
 
+    def test_calculate_costs(self, estimation_service, sample_pricing):
+        """Test cost breakdown from precomputed per-token prices."""
+        breakdown = estimation_service._calculate_costs(
+            1000,
+            500,
+            sample_pricing["openai:gpt-4o-mini"],
+            RAGConfig(embedding_tokens=1000),
+        )
+
+        assert breakdown.model_input_cost == pytest.approx(0.15)
+        assert breakdown.model_output_cost == pytest.approx(0.30)
+        assert breakdown.embedding_cost == pytest.approx(0.02)
+        assert breakdown.vector_io_cost == 0
+
     def test_estimate_unknown_model(self, estimation_service):
         """Test estimation with unknown model."""
         request = EstimateRequest(
@@ -128,19 +97,102 @@ class TestEstimationService:
         assert result.tokenizer.approx is True
         assert any("approximation" in warning for warning in result.warnings)
 
+    def test_estimate_batch(self, estimation_service):
+        """Test batch estimation matches individual estimates."""
+        requests = [
+            EstimateRequest(
+                model="anthropic:claude-3-5-sonnet",
+                system="You are a helpful assistant that answers concisely.",
+                user=f"Question number {i} about the quarterly report figures?",
+                expected_output_tokens=100,
+            )
+            for i in range(3)
+        ]
+
+        results = estimation_service.estimate_batch(requests)
+
+        assert [result.input_tokens for result in results] == [
+            estimation_service._estimate_uncached(request).input_tokens
+            for request in requests
+        ]
+
+    def test_estimate_batch_skips_cached(self, estimation_service, monkeypatch):
+        """Test batch estimation only tokenizes requests missing from the cache."""
+        cached = EstimateRequest(
+            model="anthropic:claude-3-5-sonnet",
+            user="Cached prompt",
+            expected_output_tokens=100,
+        )
+        fresh = EstimateRequest(
+            model="anthropic:claude-3-5-sonnet",
+            user="Fresh prompt",
+            expected_output_tokens=100,
+        )
+        first = estimation_service.estimate(cached)
+
+        counted = []
+        count_tokens_many = tokenizer_factory.count_tokens_many
+
+        def record(texts, tokenizer_name):
+            counted.extend(texts)
+            return count_tokens_many(texts, tokenizer_name)
+
+        monkeypatch.setattr(tokenizer_factory, "count_tokens_many", record)
+        results = estimation_service.estimate_batch([cached, fresh])
+
+        assert results[0] is first
+        assert results[1].input_tokens == estimation_service._estimate_uncached(fresh).input_tokens
+        assert counted == ["Fresh prompt"]
+
+    def test_estimate_cached(self, estimation_service, sample_pricing):
+        """Test repeated requests are served from the response cache."""
+        request = EstimateRequest(
+            model="anthropic:claude-3-5-sonnet",
+            user="Test prompt",
+            expected_output_tokens=100,
+        )
+
+        first = estimation_service.estimate(request)
+        assert estimation_service.estimate(request.model_copy()) is first
+
+        # Shared cached responses cannot be modified by callers
+        with pytest.raises(ValidationError):
+            first.input_tokens = 0
+
+        # Updating pricing drops cached estimates
+        estimation_service.update_pricing(sample_pricing)
+        assert estimation_service.estimate(request) is not first
+
+    def test_estimate_cache_hash_collision(self, estimation_service):
+        """Test requests with colliding hashes get their own responses."""
+        # Python hashes ints modulo 2**61 - 1, so these two keys share a hash
+        first = estimation_service.estimate(EstimateRequest(
+            model="anthropic:claude-3-5-sonnet",
+            user="hi",
+            expected_output_tokens=0,
+        ))
+        second = estimation_service.estimate(EstimateRequest(
+            model="anthropic:claude-3-5-sonnet",
+            user="hi",
+            expected_output_tokens=2**61 - 1,
+        ))
+
+        assert second is not first
+        assert second.output_tokens == 2**61 - 1
+
 
 class TestAPIEndpoints:
     """Test API endpoints."""
 
-    def test_health_check(self, client):
+    async def test_health_check(self, client):
         """Test health check endpoint."""
-        response = client.get("/healthz/")
+        response = await client.get("/healthz/")
         assert response.status_code == 200
         data = response.json()
         assert "ok" in data
         assert "models" in data
 
-    def test_estimate_endpoint(self, client):
+    async def test_estimate_endpoint(self, client):
         """Test estimate endpoint."""
         request_data = {
             "model": "openai:gpt-4o-mini",
@@ -149,7 +201,7 @@ class TestAPIEndpoints:
             "expected_output_tokens": 250,
         }
 
-        response = client.post("/estimate/", json=request_data)
+        response = await client.post("/estimate/", json=request_data)
         assert response.status_code == 200
 
         data = response.json()
@@ -158,7 +210,7 @@ class TestAPIEndpoints:
         assert data["output_tokens"] == 250
         assert data["cost"] > 0
 
-    def test_batch_estimate_endpoint(self, client):
+    async def test_batch_estimate_endpoint(self, client):
         """Test batch estimate endpoint."""
         request_data = {
             "requests": [
@@ -175,7 +227,7 @@ class TestAPIEndpoints:
             ],
         }
 
-        response = client.post("/estimate/batch", json=request_data)
+        response = await client.post("/estimate/batch", json=request_data)
         assert response.status_code == 200
 
         data = response.json()
@@ -184,16 +236,16 @@ class TestAPIEndpoints:
         assert data["total_input_tokens"] > 0
         assert data["total_output_tokens"] == 300
 
-    def test_models_endpoint(self, client):
+    async def test_models_endpoint(self, client):
         """Test models endpoint."""
-        response = client.get("/models/")
+        response = await client.get("/models/")
         assert response.status_code == 200
 
         data = response.json()
         assert "models" in data
         assert len(data["models"]) > 0
 
-    def test_estimate_unknown_model(self, client):
+    async def test_estimate_unknown_model(self, client):
         """Test estimate with unknown model."""
         request_data = {
             "model": "unknown:model",
@@ -201,10 +253,10 @@ class TestAPIEndpoints:
             "expected_output_tokens": 100,
         }
 
-        response = client.post("/estimate/", json=request_data)
+        response = await client.post("/estimate/", json=request_data)
         assert response.status_code == 400
 
-    def test_estimate_negative_tokens(self, client):
+    async def test_estimate_negative_tokens(self, client):
         """Test estimate with negative output tokens."""
         request_data = {
             "model": "openai:gpt-4o-mini",
@@ -212,9 +264,31 @@ class TestAPIEndpoints:
             "expected_output_tokens": -1,
         }
 
-        response = client.post("/estimate/", json=request_data)
+        response = await client.post("/estimate/", json=request_data)
         assert response.status_code == 422  # Validation error
 
+    async def test_estimate_malformed_json(self, client):
+        """Test estimate with a malformed JSON body."""
+        response = await client.post(
+            "/estimate/",
+            content=b'{"model": "openai:gpt-4o-mini",',
+            headers={"Content-Type": "application/json"},
+        )
+        assert response.status_code == 422
+
+    async def test_estimate_parses_body_with_orjson(self, client):
+        """Test request bodies are parsed by orjson rather than stdlib json."""
+        # stdlib json accepts NaN, so only the orjson parser rejects this body
+        response = await client.post(
+            "/estimate/",
+            content=(
+                b'{"model": "anthropic:claude-3-5-sonnet", "user": "Test",'
+                b' "expected_output_tokens": 10, "extra": NaN}'
+            ),
+            headers={"Content-Type": "application/json"},
+        )
+        assert response.status_code == 422
+
 
 class TestPricingLoader:
     """Test pricing loader functionality."""
@@ -224,7 +298,7 @@ class TestPricingLoader:
         loader = PricingLoader()
         # Convert PricingConfig objects to dicts for testing
         pricing_dict = {
-            model: config.model_dump()
+            model: config.to_dict()
             for model, config in sample_pricing.items()
         }
         loader._validate_and_store(pricing_dict)
@@ -238,7 +312,7 @@ class TestPricingLoader:
         loader = PricingLoader()
         # Convert PricingConfig objects to dicts for testing
         pricing_dict = {
-            model: config.model_dump()
+            model: config.to_dict()
             for model, config in sample_pricing.items()
         }
         loader._validate_and_store(pricing_dict)
@@ -1,4 +1,6 @@
 
+import httpx
+import orjson
 import pytest
 
 from app.pricing_loader import PricingConfig, PricingLoader
@@ -64,6 +66,34 @@ class TestPricingLoader:
         loader_with_url = PricingLoader("https://example.com/pricing.json")
         assert loader_with_url.pricing_url == "https://example.com/pricing.json"
 
+    async def test_load_from_url_uses_shared_client(self):
+        """Test loading pricing from a URL through an injected client."""
+        requested_urls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested_urls.append(str(request.url))
+            return httpx.Response(
+                200,
+                json={
+                    "openai:gpt-4o-mini": {
+                        "vendor": "openai",
+                        "context": 128000,
+                        "input_per_1k": 0.15,
+                        "output_per_1k": 0.60,
+                        "tokenizer": "o200k_base",
+                        "kind": "chat",
+                    },
+                },
+            )
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            loader = PricingLoader("https://example.com/pricing.json", client=client)
+            await loader.load_pricing()
+            await loader.load_pricing()
+
+        assert requested_urls == ["https://example.com/pricing.json"] * 2
+        assert "openai:gpt-4o-mini" in loader.pricing_data
+
     def test_validate_and_store_valid_data(self):
         """Test validating and storing valid pricing data."""
         loader = PricingLoader()
@@ -165,3 +195,10 @@ class TestPricingLoader:
         assert "openai:gpt-4o-mini" in models
         assert models["openai:gpt-4o-mini"]["vendor"] == "openai"
         assert models["openai:gpt-4o-mini"]["context"] == 128000
+
+        # Serialized listing is precomputed alongside the dict
+        assert orjson.loads(loader.models_json) == {"models": models}
+
+        # The shared listing is read-only
+        with pytest.raises(TypeError):
+            models["openai:gpt-4o-mini"]["vendor"] = "other"
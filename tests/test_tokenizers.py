@@ -1,4 +1,15 @@
-from app.tokenizers import tokenizer_factory
+import logging
+
+import pytest
+
+import app.tokenizers as tokenizers_module
+from app.config import settings
+from app.tokenizers import (
+    TokenizerFactory,
+    _make_llama_tokenizer,
+    _make_tokenizer,
+    tokenizer_factory,
+)
 from app.tokenizers.anthropic_approx import AnthropicTokenizer
 from app.tokenizers.llama_bpe_approx import LlamaTokenizer
 from app.tokenizers.openai_tiktoken import OpenAITokenizer
@@ -72,6 +83,99 @@ class TestTokenizers:
         assert tokens > 0
         assert approx is True
 
+    def test_tokenizer_factory_is_approx(self):
+        """Test approximation flag lookup without counting tokens."""
+        assert tokenizer_factory.is_approx("o200k_base") is False
+        assert tokenizer_factory.is_approx("anthropic_approx_bpe") is True
+        assert tokenizer_factory.is_approx("llama_approx_bpe") is True
+
+    def test_tokenizer_factory_batch(self):
+        """Test batch counting matches individual counts."""
+        texts = ["You are helpful.", "Summarize the article.", '{"tools": []}']
+
+        for name in ("o200k_base", "anthropic_approx_bpe", "llama_approx_bpe"):
+            expected = sum(tokenizer_factory.count_tokens(text, name)[0] for text in texts)
+            assert tokenizer_factory.count_tokens_batch(texts, name) == expected
+
+    def test_tokenizer_factory_count_many(self):
+        """Test per-text batch counting, including short and cached texts."""
+        factory = TokenizerFactory()
+        long_text = "This is a test sentence for tokenization. " * 4
+        texts = ["Hi", "", long_text, "Summarize the article."]
+
+        for name in ("anthropic_approx_bpe", "llama_approx_bpe"):
+            expected = [factory.count_tokens(text, name)[0] for text in texts]
+            assert factory.count_tokens_many(texts, name) == expected
+
+    def test_llama_tokenizer_fallback(self, monkeypatch, tmp_path, caplog):
+        """Test Llama falls back to approximation without a tokenizer.json."""
+        monkeypatch.setattr(settings, "llama_tokenizer_path", None)
+        assert isinstance(_make_llama_tokenizer(), LlamaTokenizer)
+
+        monkeypatch.setattr(settings, "llama_tokenizer_path", str(tmp_path / "missing.json"))
+        with caplog.at_level(logging.WARNING, logger="app.tokenizers"):
+            assert isinstance(_make_llama_tokenizer(), LlamaTokenizer)
+        assert "missing.json not found" in caplog.text
+
+    def test_llama_hf_tokenizer(self, monkeypatch, tmp_path):
+        """Test Llama uses the configured tokenizer.json for exact counts."""
+        tokenizers = pytest.importorskip("tokenizers")
+        from app.tokenizers.llama_hf import LlamaHFTokenizer
+
+        vocab = {"[UNK]": 0, "hello": 1, "world": 2, "!": 3}
+        hf_tokenizer = tokenizers.Tokenizer(
+            tokenizers.models.WordLevel(vocab, unk_token="[UNK]"),
+        )
+        hf_tokenizer.pre_tokenizer = tokenizers.pre_tokenizers.Whitespace()
+        tokenizer_path = tmp_path / "tokenizer.json"
+        hf_tokenizer.save(str(tokenizer_path))
+        monkeypatch.setattr(settings, "llama_tokenizer_path", str(tokenizer_path))
+
+        tokenizer = _make_llama_tokenizer()
+        assert isinstance(tokenizer, LlamaHFTokenizer)
+        assert tokenizer.approx is False
+
+        assert tokenizer.count_tokens("") == (0, False)
+        assert tokenizer.count_tokens("hello world!") == (3, False)
+
+        texts = ["hello world!", "hello", "unknown words here"]
+        assert tokenizer.count_tokens_many(texts) == [
+            tokenizer.count_tokens(text)[0] for text in texts
+        ]
+
+        # Tokenizer failures surface as ValueError, like the other tokenizers
+        with pytest.raises(ValueError, match="Tokenization failed"):
+            tokenizer.count_tokens_many([None])
+
+        # The exact tokenizer is reported under its own name
+        _make_tokenizer.cache_clear()
+        try:
+            assert tokenizer_factory.reported_name("llama_approx_bpe") == "llama_bpe"
+            assert tokenizer_factory.is_approx("llama_approx_bpe") is False
+        finally:
+            _make_tokenizer.cache_clear()
+
+    def test_tokenizer_factory_warm_up(self, monkeypatch):
+        """Test warm-up survives failing tokenizers and builds each name once."""
+        built = []
+
+        def make_tokenizer(tokenizer_name):
+            built.append(tokenizer_name)
+            if tokenizer_name == "broken":
+                raise ValueError("encoding unavailable")
+            return AnthropicTokenizer()
+
+        monkeypatch.setattr(tokenizers_module, "_make_tokenizer", make_tokenizer)
+        factory = TokenizerFactory()
+
+        factory.warm_up({"broken", "anthropic_approx_bpe", "llama_approx_bpe"})
+        assert sorted(built) == ["anthropic_approx_bpe", "broken", "llama_approx_bpe"]
+
+        # Only the failed name is retried on a second warm-up
+        built.clear()
+        factory.warm_up({"broken", "anthropic_approx_bpe", "llama_approx_bpe"})
+        assert built == ["broken"]
+
     def test_tokenizer_factory_unknown(self):
         """Test tokenizer factory with unknown tokenizer."""
         # Should default to OpenAI tokenizer
@@ -93,6 +197,19 @@ class TestTokenizers:
         tokens2, _ = tokenizer_factory.count_tokens(text, "anthropic_approx_bpe")
         assert tokens1 == tokens2
 
+    def test_tokenizer_factory_count_cache(self):
+        """Test long texts are memoized and short texts are not."""
+        factory = TokenizerFactory()
+        long_text = "This is a test sentence for tokenization. " * 4
+
+        first = factory.count_tokens(long_text, "anthropic_approx_bpe")
+        assert factory.count_tokens(long_text, "anthropic_approx_bpe") == first
+        assert factory.count_tokens(long_text, "llama_approx_bpe")[0] > 0
+        assert len(factory._count_cache) == 2
+
+        factory.count_tokens("Hello", "anthropic_approx_bpe")
+        assert len(factory._count_cache) == 2
+
     def test_tokenizer_edge_cases(self):
         """Test tokenizer edge cases."""
         # Empty string